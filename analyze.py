@@ -31,9 +31,9 @@ def main():
     )
     parser.add_argument(
         '--output', '-o',
-        choices=['bar', 'pie', 'both'],
+        choices=['bar', 'pie', 'both', 'none'],
         default='both',
-        help='Type of visualization output (default: both)'
+        help="Type of visualization output, or 'none' to skip plotting (default: both)"
     )
     parser.add_argument(
         '--log-file', '-l',
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import argparse
+from pathlib import Path
+
+from timetracker.binlog import convert_to_csv
+from timetracker.config import DEFAULT_LOG_FILE
+
+
+def main():
+    """Main entry point for converting a binary activity log to CSV."""
+    parser = argparse.ArgumentParser(description='Convert a binary activity log to CSV.')
+    parser.add_argument(
+        'binary_log',
+        type=Path,
+        help='Path to the binary log written by track --binary'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        type=Path,
+        default=DEFAULT_LOG_FILE,
+        help=f'Path to the CSV file to write (default: {DEFAULT_LOG_FILE})'
+    )
+    parser.add_argument(
+        '--force', '-f',
+        action='store_true',
+        help='Overwrite the output file if it already exists'
+    )
+    args = parser.parse_args()
+
+    try:
+        count = convert_to_csv(args.binary_log, args.output, overwrite=args.force)
+        print(f"Wrote {count} rows to {args.output}")
+    except FileExistsError:
+        parser.error(f"{args.output} already exists; pass --force to overwrite it")
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
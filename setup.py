@@ -14,10 +14,17 @@ setup(
         "pymonctl>=1.0.0",  # Update version as needed
         "pywinctl>=1.0.0",  # Update version as needed
     ],
+    extras_require={
+        "arrow": [
+            "pandas>=2.0.0",
+            "pyarrow>=10.0.0",
+        ],
+    },
     entry_points={
         'console_scripts': [
             'track=track:main',
             'analyze=analyze:main',
+            'replay=replay:main',
         ],
     },
     author="RustingSword",
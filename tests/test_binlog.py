@@ -0,0 +1,82 @@
+"""Tests for the binary framed activity log."""
+
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from timetracker.binlog import (
+        BINARY_LOG_MAGIC,
+        convert_to_csv,
+        pack_record,
+        read_records,
+        truncate_torn_tail,
+    )
+except Exception as e:  # the package imports pywinctl, which needs a desktop session
+    raise unittest.SkipTest(f"timetracker.binlog unavailable: {e}")
+
+ROWS = [
+    ("Google Chrome", 'a, "b" - Google Chrome', 1760400000),
+    ("Terminal", "line\nbreak é 中文", 1760400034),
+    ("_pause", "", 1760400640),
+]
+
+
+class BinlogTest(unittest.TestCase):
+    """Records written to a binary log must read back exactly."""
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.log_file = Path(self._dir.name) / "activity_log.bin"
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _write(self, *chunks: bytes) -> None:
+        self.log_file.write_bytes(BINARY_LOG_MAGIC + b"".join(chunks))
+
+    def test_round_trip(self):
+        self._write(*(pack_record(*row) for row in ROWS))
+        self.assertEqual(list(read_records(self.log_file)), ROWS)
+
+    def test_convert_to_csv(self):
+        self._write(*(pack_record(*row) for row in ROWS))
+        csv_file = Path(self._dir.name) / "activity_log.csv"
+        self.assertEqual(convert_to_csv(self.log_file, csv_file), len(ROWS))
+        with open(csv_file, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[1:], [[app, title, str(ts)] for app, title, ts in ROWS])
+        with self.assertRaises(FileExistsError):
+            convert_to_csv(self.log_file, csv_file)
+
+    def test_torn_tail_is_skipped_on_read(self):
+        self._write(pack_record(*ROWS[0]), pack_record(*ROWS[1])[:-3])
+        self.assertEqual(list(read_records(self.log_file)), ROWS[:1])
+
+    def test_truncate_torn_tail_before_appending(self):
+        good = pack_record(*ROWS[0])
+        torn = pack_record(*ROWS[1])[:-3]
+        self._write(good, torn)
+        self.assertEqual(truncate_torn_tail(self.log_file), len(torn))
+        self.assertEqual(self.log_file.read_bytes(), BINARY_LOG_MAGIC + good)
+
+        with open(self.log_file, "ab") as f:
+            f.write(pack_record(*ROWS[1]) + pack_record(*ROWS[2]))
+        self.assertEqual(list(read_records(self.log_file)), ROWS)
+
+    def test_truncate_torn_header(self):
+        self._write(pack_record(*ROWS[0]), b"\x01\x02")
+        self.assertEqual(truncate_torn_tail(self.log_file), 2)
+        self.assertEqual(truncate_torn_tail(self.log_file), 0)
+
+    def test_rejects_non_binary_log(self):
+        self.log_file.write_bytes(b"app_name,title,timestamp\r\n")
+        with self.assertRaises(ValueError):
+            list(read_records(self.log_file))
+        with self.assertRaises(ValueError):
+            truncate_torn_tail(self.log_file)
+
+
+if __name__ == "__main__":
+    unittest.main()
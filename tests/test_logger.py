@@ -0,0 +1,45 @@
+"""Tests for the activity logger's CSV row formatting."""
+
+import csv
+import io
+import random
+import unittest
+
+try:
+    from timetracker.logger import _quote
+except Exception as e:  # pywinctl/pymonctl need a desktop session to import
+    raise unittest.SkipTest(f"timetracker.logger unavailable: {e}")
+
+
+def _csv_row(*fields) -> str:
+    """Format a row with the csv module's default dialect."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(fields)
+    return buffer.getvalue()
+
+
+class QuoteTest(unittest.TestCase):
+    """_quote must produce exactly what csv.writer writes for the log rows."""
+
+    def test_matches_csv_writer(self):
+        fields = [
+            "", "plain", "a,b", 'say "hi"', "line\nbreak", "carriage\rreturn",
+            " padded ", "tab\there", "'single'", "é ü 中文", '",\r\n',
+        ]
+        for field in fields:
+            with self.subTest(field=field):
+                self.assertEqual(f"{_quote(field)},{_quote(field)},1\r\n",
+                                 _csv_row(field, field, 1))
+
+    def test_matches_csv_writer_on_random_fields(self):
+        rng = random.Random(0)
+        alphabet = ["a", " ", ",", '"', "\n", "\r", "\t", "'", "é", "\\", "-"]
+        for _ in range(20_000):
+            app_name = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+            title = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+            self.assertEqual(f"{_quote(app_name)},{_quote(title)},1760400000\r\n",
+                             _csv_row(app_name, title, 1760400000))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,24 @@
 """Activity analysis module for the time tracker application."""
 
+import importlib.util
 import json
 import logging
+import os
 import re
-import urllib.parse
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from rich.console import Console
 from rich.table import Table
 
 from .config import (
+    ACTIVITY_FIELDS,
+    CSV_CHUNK_SIZE,
+    PARQUET_ROW_GROUP_SIZE,
     UNKNOWN_CATEGORY,
     MIN_DURATION_THRESHOLD,
     VisualizationConfig
@@ -23,10 +29,86 @@ from .visualization import ActivityVisualizer
 logger = logging.getLogger('timetracker.analyzer')
 console = Console()
 
+SECONDS_PER_HOUR = 3600
+
+# pyarrow is optional; when present it is used as the CSV parser. The Arrow
+# dtype_backend needs pandas 2, so older pandas keeps the C parser
+HAS_PYARROW = (
+    importlib.util.find_spec("pyarrow") is not None
+    and int(pd.__version__.split(".")[0]) >= 2
+)
+
+# Parquet metadata key recording the size and mtime of the CSV it was built from
+PARQUET_SOURCE_KEY = b"timetracker.source"
+
+# Column types of the activity log, so the CSV parsers skip type inference
+CSV_DTYPES = {"app_name": "string", "title": "string", "timestamp": "int64"}
+ARROW_CSV_DTYPES = {
+    "app_name": "string[pyarrow]",
+    "title": "string[pyarrow]",
+    "timestamp": "int64[pyarrow]",
+}
+
+# Captures the network location (host[:port]) of the first URL in a title
+_NETLOC_RE = re.compile(r"https?://(?P<netloc>[^/\s?#]*)")
+
+
+def _parse_chrome_title(title: str) -> str:
+    """Extract the domain from a Chrome window title."""
+    url_match = _NETLOC_RE.search(title)
+    if url_match:
+        return url_match.group("netloc")
+    # Handle other Chrome windows (e.g. New Tab, Settings)
+    return "Chrome - " + title.split(" - ")[-1]
+
+
+def _parse_chrome_titles(titles: pd.Series) -> pd.Series:
+    """Vectorized _parse_chrome_title over a Series of titles."""
+    netlocs = titles.str.extract(_NETLOC_RE.pattern, expand=False)
+    return netlocs.where(netlocs.notna(), "Chrome - " + titles.str.rpartition(" - ")[2])
+
+
+def _parse_vscode_title(title: str) -> str:
+    """Extract the file name from a VS Code window title."""
+    parts = title.split(" - ")
+    return f"VSCode - {parts[0]}" if parts else "VSCode"
+
+
+def _parse_vscode_titles(titles: pd.Series) -> pd.Series:
+    """Vectorized _parse_vscode_title over a Series of titles."""
+    return "VSCode - " + titles.str.partition(" - ")[0]
+
+
+# Title parsers for apps whose name contains the key, as
+# (parser for one title, parser for a Series of titles) pairs
+_APP_TITLE_PARSERS: Dict[str, Tuple[Callable[[str], str], Callable[[pd.Series], pd.Series]]] = {
+    "Google Chrome": (_parse_chrome_title, _parse_chrome_titles),
+    "Visual Studio Code": (_parse_vscode_title, _parse_vscode_titles),
+}
+
+
+@lru_cache(maxsize=256)
+def _title_parser_key(app_name: str) -> Optional[str]:
+    """Resolve the _APP_TITLE_PARSERS key for an app name once per distinct name."""
+    for key in _APP_TITLE_PARSERS:
+        if key in app_name:
+            return key
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _title_to_activity(app_name: str, title: str) -> str:
+    """Map an app name and window title to an activity label."""
+    key = _title_parser_key(app_name)
+    return _APP_TITLE_PARSERS[key][0](title) if key else app_name
+
 
 class ActivityAnalyzer:
     """Analyzes time tracking data and generates insights."""
 
+    # Parsed category files keyed by (path, mtime)
+    _category_cache: Dict[Tuple[str, float], Dict[str, str]] = {}
+
     def __init__(self, log_file: Path, category_file: Path):
         """Initialize the analyzer.
         
@@ -37,14 +119,18 @@ class ActivityAnalyzer:
         self.log_file = log_file
         self.category_file = category_file
         self.app_categories = self._load_categories()
+        self._dirty = False  # True when app_categories has unsaved changes
         self.visualizer = ActivityVisualizer()
 
     def _load_categories(self) -> Dict[str, str]:
-        """Load category mappings from JSON file."""
+        """Load category mappings from JSON file, reusing a cached parse if unchanged."""
         try:
             if self.category_file.exists():
-                with open(self.category_file, "r") as f:
-                    return json.load(f)
+                key = (str(self.category_file), self.category_file.stat().st_mtime)
+                if key not in self._category_cache:
+                    with open(self.category_file, "r") as f:
+                        self._category_cache[key] = json.load(f)
+                return dict(self._category_cache[key])
             return {}
         except Exception as e:
             logger.error("Error loading categories: %s", str(e))
@@ -53,8 +139,14 @@ class ActivityAnalyzer:
     def _save_categories(self) -> None:
         """Save category mappings to JSON file."""
         try:
-            with open(self.category_file, "w") as f:
+            if self.category_file.exists():
+                key = (str(self.category_file), self.category_file.stat().st_mtime)
+                self._category_cache.pop(key, None)
+            tmp_file = self.category_file.with_name(self.category_file.name + ".tmp")
+            with open(tmp_file, "w") as f:
                 json.dump(self.app_categories, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_file, self.category_file)
+            self._dirty = False
         except Exception as e:
             logger.error("Error saving categories: %s", str(e))
 
@@ -62,90 +154,265 @@ class ActivityAnalyzer:
         """Parse the window title to extract meaningful information."""
         if pd.isnull(row["title"]):
             return UNKNOWN_CATEGORY
-            
-        if "Google Chrome" in row["app_name"]:
-            # Extract domain from Chrome window titles
-            url_match = re.search(r"https?://[^\s]*", row["title"])
-            if url_match:
-                try:
-                    return urllib.parse.urlparse(url_match.group()).netloc
-                except Exception:
-                    return "Unknown URL"
-            # Handle other Chrome windows (e.g. New Tab, Settings)
-            return "Chrome - " + row["title"].split(" - ")[-1]
-        elif "Visual Studio Code" in row["app_name"]:
-            # Extract file name from VS Code window titles
-            parts = row["title"].split(" - ")
-            return f"VSCode - {parts[0]}" if parts else "VSCode"
-        else:
-            return row["app_name"]
+        return _title_to_activity(row["app_name"], row["title"])
+
+    def parse_titles(self, activity_df: pd.DataFrame) -> pd.Series:
+        """Vectorized equivalent of parse_title over a whole DataFrame."""
+        app_names = activity_df["app_name"]
+        activities = app_names.to_numpy(dtype=object).copy()
+
+        # Window titles repeat heavily, so string work runs on distinct titles
+        # only and is expanded back to rows by title code (-1 = missing title)
+        title_codes, unique_titles = pd.factorize(activity_df["title"])
+        if len(unique_titles) == 0:
+            return pd.Series(UNKNOWN_CATEGORY, index=activity_df.index, dtype=object)
+        unique_titles = pd.Series(unique_titles)
+
+        # Parser key per row, resolved once per distinct app (-1 = missing app)
+        app_codes, unique_apps = pd.factorize(app_names)
+        app_keys = np.array([_title_parser_key(app) for app in unique_apps] + [None],
+                            dtype=object)[app_codes]
+
+        for key, (_, parse_many) in _APP_TITLE_PARSERS.items():
+            rows = app_keys == key
+            if rows.any():
+                parsed = parse_many(unique_titles).to_numpy(dtype=object)
+                activities[rows] = parsed[title_codes[rows]]
+
+        activities[title_codes == -1] = UNKNOWN_CATEGORY
+        return pd.Series(activities, index=activity_df.index, dtype=object)
 
     def map_activity_to_category(self, activity: str) -> str:
         """Map an activity to its category, prompting for input if unknown."""
-        if activity in self.app_categories:
-            return self.app_categories[activity]
+        if activity not in self.app_categories:
+            self.prompt_for_categories([activity])
+        return self.app_categories.get(activity, UNKNOWN_CATEGORY)
 
-        # Show existing categories to help user choose
-        existing_categories = set(self.app_categories.values())
-        if existing_categories:
-            console.print("\nExisting categories:", style="bold blue")
-            console.print(", ".join(sorted(existing_categories)))
+    def prompt_for_categories(self, activities: List[str]) -> None:
+        """Prompt for the category of each activity that has none yet.
 
-        category = console.input(f"\n[yellow]Enter category for '{activity}'[/yellow]: ")
-        self.app_categories[activity] = category
-        self._save_categories()
-        return category
+        An empty answer skips the activity for this run. A JSON object is
+        merged into the mapping, so several activities can be categorized
+        with one paste. The mapping is saved once at the end.
+        """
+        for activity in activities:
+            if activity in self.app_categories:
+                continue
+
+            # Show existing categories to help user choose
+            existing_categories = set(self.app_categories.values())
+            if existing_categories:
+                console.print("\nExisting categories:", style="bold blue")
+                console.print(", ".join(sorted(existing_categories)))
+
+            answer = console.input(
+                f"\n[yellow]Enter category for '{activity}'[/yellow] "
+                "(empty to skip, or a JSON object): "
+            ).strip()
+            if not answer:
+                continue
+            if answer.startswith("{"):
+                try:
+                    mapping = json.loads(answer)
+                except (json.JSONDecodeError, TypeError, ValueError) as e:
+                    logger.error("Invalid category JSON: %s", str(e))
+                    continue
+                if not (isinstance(mapping, dict) and all(
+                        isinstance(value, str) and value
+                        for item in mapping.items() for value in item)):
+                    logger.error("Invalid category JSON: expected an object "
+                                 "mapping activity names to category names")
+                    continue
+                self.app_categories.update(mapping)
+            else:
+                self.app_categories[activity] = answer
+            self._dirty = True
+
+        if self._dirty:
+            self._save_categories()
+
+    def _read_csv_pyarrow(self) -> pd.DataFrame:
+        """Read the whole CSV log with the pyarrow parser into Arrow-backed columns."""
+        return pd.read_csv(
+            self.log_file,
+            usecols=ACTIVITY_FIELDS,
+            dtype=ARROW_CSV_DTYPES,
+            engine="pyarrow",
+            dtype_backend="pyarrow"
+        )
+
+    def _ensure_parquet(self) -> Optional[Path]:
+        """Return an up-to-date Parquet copy of the log, converting it if needed.
+
+        Returns None if the Parquet file cannot be written, in which case
+        callers should fall back to reading the CSV.
+        """
+        parquet_file = Path(self.log_file).with_suffix(".parquet")
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            # Stat the CSV before reading it: rows the tracker appends during the
+            # conversion then change the stamp and trigger a fresh conversion
+            csv_stat = os.stat(self.log_file)
+            source = f"{csv_stat.st_size}:{csv_stat.st_mtime_ns}".encode()
+            if parquet_file.exists():
+                metadata = pq.read_schema(parquet_file).metadata or {}
+                if metadata.get(PARQUET_SOURCE_KEY) == source:
+                    return parquet_file
+
+            table = pa.Table.from_pandas(self._read_csv_pyarrow(), preserve_index=False)
+            table = table.replace_schema_metadata(
+                {**(table.schema.metadata or {}), PARQUET_SOURCE_KEY: source}
+            )
+            tmp_file = parquet_file.with_name(parquet_file.name + ".tmp")
+            # Small row groups let the timestamp filter skip other days via statistics
+            pq.write_table(
+                table,
+                tmp_file,
+                compression="zstd",
+                row_group_size=PARQUET_ROW_GROUP_SIZE
+            )
+            os.replace(tmp_file, parquet_file)
+            logger.info("Converted activity log to Parquet: %s", str(parquet_file))
+            return parquet_file
+        except Exception as e:
+            logger.warning("Could not use Parquet copy of activity log: %s", str(e))
+            return None
+
+    def _read_log(self, start_ts: int, end_ts: int) -> pd.DataFrame:
+        """Read the activity log rows whose timestamp falls in [start_ts, end_ts).
+
+        When pyarrow is available the log is read from a Parquet copy with the
+        day filter pushed down, falling back to the pyarrow CSV parser.
+        Otherwise the C parser streams the file in chunks so memory stays
+        bounded on long logs.
+        """
+        if HAS_PYARROW:
+            parquet_file = self._ensure_parquet()
+            if parquet_file is not None:
+                activity_df = pd.read_parquet(
+                    parquet_file,
+                    columns=ACTIVITY_FIELDS,
+                    filters=[("timestamp", ">=", start_ts), ("timestamp", "<", end_ts)],
+                    dtype_backend="pyarrow"
+                )
+                return activity_df.astype({"app_name": "category"})
+
+            chunks = [self._read_csv_pyarrow()]
+        else:
+            chunks = pd.read_csv(
+                self.log_file,
+                usecols=ACTIVITY_FIELDS,
+                dtype=CSV_DTYPES,
+                engine="c",
+                chunksize=CSV_CHUNK_SIZE
+            )
+
+        day_chunks = []
+        for chunk in chunks:
+            timestamps = chunk["timestamp"].to_numpy()
+            if chunk["timestamp"].is_monotonic_increasing:
+                # Within a sorted chunk the day is a contiguous slice. Later
+                # chunks are still read: a clock stepped back can put more of
+                # the day after a chunk that already ran past it
+                lo, hi = np.searchsorted(timestamps, [start_ts, end_ts])
+                day_chunks.append(chunk.iloc[lo:hi])
+            else:
+                day_chunks.append(chunk[(timestamps >= start_ts) & (timestamps < end_ts)])
+
+        if not day_chunks:
+            return pd.DataFrame(columns=ACTIVITY_FIELDS)
+        activity_df = pd.concat(day_chunks, ignore_index=True)
+        return activity_df.astype({"app_name": "category"})
+
+    @staticmethod
+    def _day_bounds(target_date: date) -> Tuple[int, int]:
+        """Return the [start, end) unix timestamps covering the given local day."""
+        start_ts = int(datetime.combine(target_date, time.min).timestamp())
+        end_ts = int(datetime.combine(target_date + timedelta(days=1), time.min).timestamp())
+        return start_ts, end_ts
 
     def process_data(self, target_date: Optional[date] = None) -> Tuple[pd.DataFrame, List[ActivitySummary]]:
         """Process activity data for the specified date."""
+        # Only rows inside the [start, end) window of the target day are kept
+        target_date = target_date or date.today()
+        start_ts, end_ts = self._day_bounds(target_date)
         try:
-            activity_df = pd.read_csv(self.log_file)
+            activity_df = self._read_log(start_ts, end_ts)
         except Exception as e:
             logger.error("Error reading activity log: %s", str(e))
             raise
 
-        # Convert timestamp to datetime
-        activity_df["date"] = pd.to_datetime(activity_df["timestamp"], unit="s")
-        
-        # Filter by date
-        target_date = target_date or date.today()
-        activity_df = activity_df[activity_df["date"].dt.date == target_date]
-        
         if activity_df.empty:
             logger.warning(f"No data found for date: {target_date}")
             return pd.DataFrame(), []
 
-        # Calculate durations
-        activity_df["duration"] = activity_df["timestamp"].shift(-1) - activity_df["timestamp"]
-        activity_df = activity_df[:-1]  # Remove last row (no duration)
-        
-        # Filter out very short durations
-        activity_df = activity_df[activity_df["duration"] >= MIN_DURATION_THRESHOLD]
+        # Calculate durations (the last row has no successor, so it is dropped).
+        # Durations are whole seconds within a single day, so int32 suffices.
+        timestamps = activity_df["timestamp"].to_numpy()
+        durations = np.subtract(
+            timestamps[1:], timestamps[:-1],
+            out=np.empty(len(timestamps) - 1, dtype=np.int32),
+            casting="unsafe"
+        )
 
-        # Parse activities and map to categories
-        activity_df["activity"] = activity_df.apply(self.parse_title, axis=1)
-        activity_df["category"] = activity_df["activity"].apply(self.map_activity_to_category)
-        
-        # Remove unknown categories
-        activity_df = activity_df[activity_df["category"] != UNKNOWN_CATEGORY]
+        # Filter out very short durations with a single positional take
+        rows = np.flatnonzero(durations >= MIN_DURATION_THRESHOLD)
+        day_df = activity_df.iloc[rows]
+        durations = durations[rows]
+
+        # Parse activities and map each distinct activity to its category once.
+        # Repeated strings are stored as integer codes for cheaper grouping.
+        activity_codes, unique_activities = pd.factorize(self.parse_titles(day_df))
+        self.prompt_for_categories(unique_activities)
+        activity = pd.Categorical.from_codes(activity_codes, categories=unique_activities)
+        # Categories are coded per distinct activity, then expanded by activity
+        # code without hashing any row strings. Code -1 marks a missing
+        # activity, which falls into the trailing Unknown slot.
+        category_codes, category_names = pd.factorize(np.array(
+            [self.app_categories.get(a, UNKNOWN_CATEGORY) for a in unique_activities]
+            + [UNKNOWN_CATEGORY],
+            dtype=object
+        ))
+        category = pd.Categorical.from_codes(
+            category_codes[activity_codes], categories=category_names
+        )
+
+        # Remove unknown categories by comparing integer category codes; the
+        # trailing slot above guarantees Unknown is always a category
+        known = category.codes != category.categories.get_loc(UNKNOWN_CATEGORY)
+
+        # Build the final per-day frame once from the filtered columns
+        activity_df = pd.DataFrame({
+            "app_name": day_df["app_name"].array[known],
+            "title": day_df["title"].array[known],
+            "timestamp": day_df["timestamp"].to_numpy()[known],
+            "duration": durations[known],
+            "activity": activity[known],
+            "category": category[known],
+        })
 
         # Calculate summary statistics
-        summary_df = (
-            activity_df.groupby("category")["duration"]
-            .agg(['sum', 'count'])
-            .sort_values('sum', ascending=False)
+        category_codes = activity_df["category"].cat.codes.to_numpy()
+        categories = activity_df["category"].cat.categories
+        sums = np.bincount(
+            category_codes,
+            weights=activity_df["duration"].to_numpy(),
+            minlength=len(categories)
         )
-        
-        total_duration = summary_df['sum'].sum()
-        summaries = []
-        
-        for category, row in summary_df.iterrows():
-            summaries.append(ActivitySummary(
-                category=category,
-                minutes=row['sum'] / 60,
-                count=row['count'],
-                percentage=(row['sum'] / total_duration) * 100
-            ))
+        counts = np.bincount(category_codes, minlength=len(categories))
+        order = np.flatnonzero(counts)
+        order = order[np.argsort(-sums[order], kind="stable")]
+
+        sums, counts = sums[order], counts[order]
+        minutes = sums / 60
+        percentages = sums * 100 / sums.sum()
+
+        summaries = [
+            ActivitySummary(category=category, minutes=mins, count=int(count), percentage=pct)
+            for category, mins, count, pct in zip(categories[order], minutes, counts, percentages)
+        ]
 
         return activity_df, summaries
 
@@ -156,27 +423,38 @@ class ActivityAnalyzer:
             return
 
         console.print("\n[bold blue]Activity Insights:[/bold blue]")
-        
+
+        durations = activity_df["duration"].to_numpy()
+        app_codes = activity_df["app_name"].cat.codes.to_numpy()
+        app_names = activity_df["app_name"].cat.categories
+        # Local hour from the integer timestamps. The UTC offset is looked up per
+        # quarter hour, where DST changes fall, so it is right on both sides of one
+        timestamps = activity_df["timestamp"].to_numpy().astype(np.int64)
+        quarters, inverse = np.unique(timestamps // 900, return_inverse=True)
+        utc_offsets = np.array([
+            datetime.fromtimestamp(int(quarter) * 900).astimezone().utcoffset().total_seconds()
+            for quarter in quarters
+        ], dtype=np.int64)
+        hours = ((timestamps + utc_offsets[inverse.reshape(-1)]) // SECONDS_PER_HOUR) % 24
+
         # Most used applications
-        top_apps = (
-            activity_df.groupby("app_name")["duration"]
-            .sum()
-            .sort_values(ascending=False)
-            .head(5)
-        )
-        
         console.print("\nTop 5 Applications:")
-        for app, duration in top_apps.items():
-            console.print(f"  • {app}: {duration/60:.1f} minutes")
+        for code, duration in self._top_totals(app_codes, durations, len(app_names), 5):
+            console.print(f"  • {app_names[code]}: {duration/60:.1f} minutes")
 
         # Time distribution by hour
-        activity_df['hour'] = activity_df['date'].dt.hour
-        hourly_usage = activity_df.groupby('hour')['duration'].sum() / 60
-        
         console.print("\nPeak Activity Hours:")
-        peak_hours = hourly_usage.nlargest(3)
-        for hour, duration in peak_hours.items():
-            console.print(f"  • {hour:02d}:00 - {hour:02d}:59: {duration:.1f} minutes")
+        for hour, duration in self._top_totals(hours, durations, 24, 3):
+            console.print(f"  • {hour:02d}:00 - {hour:02d}:59: {duration/60:.1f} minutes")
+
+    @staticmethod
+    def _top_totals(keys: np.ndarray, weights: np.ndarray,
+                    size: int, limit: int) -> List[Tuple[int, float]]:
+        """Sum weights per integer key and return the largest present totals."""
+        totals = np.bincount(keys, weights=weights, minlength=size)
+        present = np.flatnonzero(np.bincount(keys, minlength=size))
+        top = present[np.argsort(-totals[present], kind="stable")[:limit]]
+        return [(int(key), totals[key]) for key in top]
 
     def print_summary(self, summaries: List[ActivitySummary]) -> None:
         """Print a formatted summary of the activity data."""
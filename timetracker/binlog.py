@@ -0,0 +1,91 @@
+"""Binary framed activity log format and conversion to CSV."""
+
+import csv
+import os
+import struct
+from pathlib import Path
+from typing import Iterator, Tuple
+
+from .config import ACTIVITY_FIELDS
+
+# Written once at the start of a binary log to tell it apart from a CSV
+BINARY_LOG_MAGIC = b"TTBLOG\x00\x01"
+# Each record: timestamp, app name length, title length, then both UTF-8 strings
+RECORD_HEADER = struct.Struct("<III")
+
+
+def pack_record(app_name: str, title: str, timestamp: int) -> bytes:
+    """Pack one activity row into a framed binary record."""
+    app = app_name.encode("utf-8")
+    text = title.encode("utf-8")
+    return RECORD_HEADER.pack(timestamp, len(app), len(text)) + app + text
+
+
+def _record_spans(data: bytes) -> Iterator[Tuple[int, int, int, int]]:
+    """Yield (timestamp, start, split, end) offsets of each complete record.
+
+    start..split holds the app name and split..end the title. Iteration stops
+    at a record cut short by a crash mid-write.
+    """
+    offset = len(BINARY_LOG_MAGIC)
+    header_size = RECORD_HEADER.size
+    while offset + header_size <= len(data):
+        timestamp, app_len, title_len = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + header_size
+        end = start + app_len + title_len
+        if end > len(data):
+            return
+        yield timestamp, start, start + app_len, end
+        offset = end
+
+
+def _read_log_bytes(log_file: Path) -> bytes:
+    """Read a binary log, checking its magic header."""
+    data = Path(log_file).read_bytes()
+    if not data.startswith(BINARY_LOG_MAGIC):
+        raise ValueError(f"{log_file} is not a binary activity log")
+    return data
+
+
+def read_records(log_file: Path) -> Iterator[Tuple[str, str, int]]:
+    """Yield (app_name, title, timestamp) rows from a binary log."""
+    data = _read_log_bytes(log_file)
+    for timestamp, start, split, end in _record_spans(data):
+        yield data[start:split].decode("utf-8"), data[split:end].decode("utf-8"), timestamp
+
+
+def truncate_torn_tail(log_file: Path) -> int:
+    """Cut a partly written record off the end of a binary log before appending.
+
+    Without this, records appended after a torn tail would be misframed.
+
+    Returns:
+        Number of bytes removed
+    """
+    data = _read_log_bytes(log_file)
+    complete = len(BINARY_LOG_MAGIC)
+    for _, _, _, end in _record_spans(data):
+        complete = end
+    if complete < len(data):
+        os.truncate(log_file, complete)
+    return len(data) - complete
+
+
+def convert_to_csv(log_file: Path, csv_file: Path, overwrite: bool = False) -> int:
+    """Write a binary log out as a CSV the analyzer can read.
+
+    Args:
+        log_file: Path to the binary log
+        csv_file: Path to the CSV to write
+        overwrite: Replace csv_file if it exists instead of raising FileExistsError
+
+    Returns:
+        Number of rows written
+    """
+    # Decode first, so a bad binary log fails before csv_file is touched
+    rows = list(read_records(log_file))
+    with open(csv_file, "w" if overwrite else "x", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(ACTIVITY_FIELDS)
+        writer.writerows(rows)
+    return len(rows)
@@ -6,17 +6,33 @@ from typing import Dict
 
 # File paths and names
 DEFAULT_LOG_FILE = "activity_log.csv"
+DEFAULT_BINARY_LOG_FILE = "activity_log.bin"
 DEFAULT_CATEGORY_FILE = "app_categories.json"
 LOG_FILE = Path(DEFAULT_LOG_FILE)
 CATEGORY_FILE = Path(DEFAULT_CATEGORY_FILE)
 
 # Time intervals and thresholds
 DEFAULT_LOG_INTERVAL = 10  # seconds
+MOUSE_POLL_INTERVAL = 1  # seconds between mouse polls for idle detection
+MAX_IDLE_POLL_INTERVAL = 300  # cap in seconds for mouse polling backoff while idle
+MOUSE_DEAD_ZONE_SQ = 25  # squared pixels the mouse must move to count as activity
+LOCK_CHECK_INTERVAL = 30  # seconds between screen lock checks while unlocked
+LOCKED_POLL_INTERVAL = 60  # seconds between checks while the screen is locked
 INACTIVITY_THRESHOLD = 600  # 10 minutes in seconds
 MIN_DURATION_THRESHOLD = 5  # seconds
+WINDOW_CHECK_INTERVAL = 30  # seconds between window queries while the mouse is still
+# Environment variables that override the two defaults above for the tracker
+INTERVAL_ENV_VAR = "TIME_TRACKER_INTERVAL"
+INACTIVITY_ENV_VAR = "TIME_TRACKER_IDLE_S"
+APP_NAME_CACHE_SIZE = 64  # window handles whose app name is remembered
 
 # CSV field names
 ACTIVITY_FIELDS = ["app_name", "title", "timestamp"]
+CSV_CHUNK_SIZE = 200_000  # rows read at a time when streaming the log
+LOG_BUFFER_SIZE = 1 << 20  # bytes buffered before rows are written to the log
+LOG_FLUSH_ROWS = 32  # pending rows that trigger a write to the log
+LOG_FLUSH_INTERVAL = 2  # seconds a pending row may wait before being written
+PARQUET_ROW_GROUP_SIZE = 10_000  # rows per Parquet row group, about a day of events
 
 # Categories
 UNKNOWN_CATEGORY = "Unknown"
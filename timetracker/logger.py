@@ -2,39 +2,159 @@
 
 import csv
 import logging
+import os
+import queue
+import subprocess
+import sys
+import threading
 import time
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import IO, Dict, List, Optional, Tuple, Union
 
 import pymonctl as pmc
 import pywinctl as pwc
 
 from .config import (
     ACTIVITY_FIELDS,
+    APP_NAME_CACHE_SIZE,
     DEFAULT_LOG_INTERVAL,
+    INACTIVITY_ENV_VAR,
     INACTIVITY_THRESHOLD,
+    INTERVAL_ENV_VAR,
+    LOCK_CHECK_INTERVAL,
+    LOCKED_POLL_INTERVAL,
+    LOG_BUFFER_SIZE,
+    LOG_FLUSH_INTERVAL,
+    LOG_FLUSH_ROWS,
+    MAX_IDLE_POLL_INTERVAL,
+    MOUSE_DEAD_ZONE_SQ,
+    MOUSE_POLL_INTERVAL,
+    WINDOW_CHECK_INTERVAL,
     LOGGING_CONFIG
 )
+from .binlog import BINARY_LOG_MAGIC, pack_record, truncate_torn_tail
 from .models import WindowInfo
 
 logger = logging.getLogger('timetracker.logger')
 
+# Tracker states: ACTIVE queries and logs windows, IDLE waits for the mouse
+ACTIVE = "active"
+IDLE = "idle"
+
+
+def _quote(field: str) -> str:
+    """Quote a CSV field the way csv.writer does with QUOTE_MINIMAL."""
+    if '"' in field:
+        return '"' + field.replace('"', '""') + '"'
+    if ',' in field or '\n' in field or '\r' in field:
+        return '"' + field + '"'
+    return field
+
+
+def _probe_screen_locked() -> Optional[bool]:
+    """Check whether the session's screen is locked, or None if unsupported here.
+
+    A probe that fails for a transient reason reports the screen as unlocked,
+    so only a missing API or tool turns lock detection off.
+    """
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+            user32 = ctypes.windll.user32
+            # Declare the handle type so it is not truncated to a C int
+            user32.OpenInputDesktop.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+            user32.OpenInputDesktop.restype = wintypes.HDESK
+            user32.CloseDesktop.argtypes = [wintypes.HDESK]
+            # The input desktop is Winlogon's while locked, which we cannot open
+            desktop = user32.OpenInputDesktop(0, False, 0x0100)  # DESKTOP_SWITCHDESKTOP
+            if not desktop:
+                return True
+            user32.CloseDesktop(desktop)
+            return False
+        if sys.platform == "darwin":
+            from Quartz import CGSessionCopyCurrentDictionary
+            session = CGSessionCopyCurrentDictionary()
+            return bool(session and session.get("CGSSessionScreenIsLocked", False))
+        session_id = os.environ.get("XDG_SESSION_ID", "auto")
+        result = subprocess.run(
+            ["loginctl", "show-session", session_id, "-p", "LockedHint", "--value"],
+            capture_output=True, text=True, timeout=2,
+        )
+        return result.returncode == 0 and result.stdout.strip() == "yes"
+    except (ImportError, FileNotFoundError):
+        return None
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+def _env_seconds(name: str, default: int) -> int:
+    """Read a positive number of seconds from the environment, else the default."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        seconds = int(value)
+        if seconds > 0:
+            return seconds
+    except ValueError:
+        pass
+    logger.warning("Ignoring %s=%r, expected a positive whole number of seconds; using %d",
+                   name, value, default)
+    return default
+
 
 class ActivityLogger:
     """Logs user activity by tracking active windows and mouse movement."""
     
-    def __init__(self, log_file: Path, log_interval: int = DEFAULT_LOG_INTERVAL):
+    def __init__(self, log_file: Path, log_interval: Optional[int] = None,
+                 mouse_poll_interval: float = MOUSE_POLL_INTERVAL, binary: bool = False,
+                 inactivity_threshold: Optional[int] = None, fsync_on_pause: bool = False):
         """Initialize the activity logger.
         
         Args:
             log_file: Path to the CSV log file
-            log_interval: Time between checks in seconds
+            log_interval: Time between active window checks in seconds, by default
+                from TIME_TRACKER_INTERVAL or DEFAULT_LOG_INTERVAL
+            mouse_poll_interval: Time between mouse position checks in seconds
+            binary: Write a binary framed log instead of CSV (see binlog)
+            inactivity_threshold: Seconds without activity before a pause is logged,
+                by default from TIME_TRACKER_IDLE_S or INACTIVITY_THRESHOLD
+            fsync_on_pause: Also fsync the log on pause and exit, not just flush it
         """
         self.log_file = log_file
+        self.binary = binary
+        if log_interval is None:
+            log_interval = _env_seconds(INTERVAL_ENV_VAR, DEFAULT_LOG_INTERVAL)
+        if inactivity_threshold is None:
+            inactivity_threshold = _env_seconds(INACTIVITY_ENV_VAR, INACTIVITY_THRESHOLD)
         self.log_interval = log_interval
+        self.mouse_poll_interval = mouse_poll_interval
+        self.inactivity_threshold = inactivity_threshold
+        self.fsync_on_pause = fsync_on_pause
+        self._poll_interval = mouse_poll_interval  # current wait, backed off while idle
+        self._state = ACTIVE
+        self._locked: Optional[bool] = False  # None once locking can't be detected
+        self._last_lock_check = float("-inf")
+        self._lock_probe_pending = False
         self.prev_info: Optional[WindowInfo] = None
+        self._prev_key: Optional[Tuple[str, str]] = None  # (app_name, title) of prev_info
+        self._last_window_check = float("-inf")  # monotonic time of the last window query
+        self._mouse_moved = False  # mouse moved since the last window query
+        self._app_name_cache: Dict[int, str] = {}  # window handle -> app name
+        self._last_hwnd: Optional[int] = None  # handle behind _last_window_info
+        self._last_window_info: Optional[WindowInfo] = None
+        self._stop = threading.Event()
+        # Blocking queries run on a worker thread: the loop posts (kind, wall
+        # time) requests and collects (kind, wall time, answer) results later
+        self._worker_requests: "queue.Queue[Optional[Tuple[str, int]]]" = queue.Queue()
+        self._worker_results: "queue.SimpleQueue[Tuple[str, int, object]]" = queue.SimpleQueue()
+        self._window_query_pending = False
         self.prev_mouse_pos: Optional[Tuple[int, int]] = None
-        self.prev_action_ts: Optional[int] = None
+        self.prev_action_ts: Optional[float] = None  # monotonic time of the last activity
+        self._file: Optional[IO] = None
+        self._pending: List[Union[str, bytes]] = []  # formatted rows not yet written
+        self._pending_since = 0.0  # monotonic time the oldest pending row was added
         
         logger.info("ActivityLogger initialized with interval: %d seconds", log_interval)
 
@@ -43,21 +163,47 @@ class ActivityLogger:
         try:
             window = pwc.getActiveWindow()
             if window is not None:
-                return WindowInfo(
-                    app_name=window.getAppName(),
-                    title=pwc.getActiveWindowTitle()
-                )
+                hwnd = getattr(window, "_hWnd", None)
+                title = pwc.getActiveWindowTitle()
+                # Same window and title as last time: hand back the same
+                # object so run() can skip the change check with an identity test
+                last = self._last_window_info
+                if hwnd is not None and hwnd == self._last_hwnd and title == last.title:
+                    return last
+                info = WindowInfo(app_name=self._get_app_name(window), title=title)
+                self._last_hwnd = hwnd
+                self._last_window_info = info
+                return info
         except Exception as e:
             logger.error("Error getting window info: %s", str(e))
         return None
 
+    def _get_app_name(self, window) -> str:
+        """Get the window's app name, cached by window handle."""
+        # getAppName() looks up the owning process, while a window's handle
+        # keeps the same app for its whole lifetime
+        hwnd = getattr(window, "_hWnd", None)
+        if hwnd is None:
+            return window.getAppName()
+        app_name = self._app_name_cache.get(hwnd)
+        if app_name is None:
+            app_name = window.getAppName()
+            if len(self._app_name_cache) >= APP_NAME_CACHE_SIZE:
+                # Dicts keep insertion order, so this evicts the oldest entry
+                del self._app_name_cache[next(iter(self._app_name_cache))]
+            self._app_name_cache[hwnd] = app_name
+        return app_name
+
     def log_window_info(self, info: WindowInfo) -> None:
         """Log window information to the CSV file."""
         try:
-            with open(self.log_file, "a", newline="") as file:
-                writer = csv.DictWriter(file, fieldnames=ACTIVITY_FIELDS)
-                writer.writerow(info.to_dict())
-            self.prev_action_ts = int(time.time())
+            if self._file is None:
+                self._open_log_file()
+            now = time.monotonic()
+            if not self._pending:
+                self._pending_since = now
+            self._write_row(*info.to_row())
+            self.prev_action_ts = now
             logger.info("Logged activity: %s - %s", info.app_name, info.title)
         except Exception as e:
             logger.error("Error logging window info: %s", str(e))
@@ -65,19 +211,101 @@ class ActivityLogger:
     def initialize_log_file(self) -> None:
         """Initialize the log file if it doesn't exist."""
         try:
-            if not self.log_file.exists():
-                with open(self.log_file, "w", newline="") as file:
-                    writer = csv.DictWriter(file, fieldnames=ACTIVITY_FIELDS)
-                    writer.writeheader()
+            # Exclusive create checks and creates in one step, so an existing
+            # log is never truncated by a racing writer
+            try:
+                file = open(self.log_file, "xb") if self.binary else open(self.log_file, "x", newline="")
+            except FileExistsError:
+                self._check_log_format()
+            else:
+                with file:
+                    if self.binary:
+                        file.write(BINARY_LOG_MAGIC)
+                    else:
+                        writer = csv.DictWriter(file, fieldnames=ACTIVITY_FIELDS)
+                        writer.writeheader()
                 logger.info("Created new log file: %s", str(self.log_file))
+            self._open_log_file()
         except Exception as e:
             logger.error("Error initializing log file: %s", str(e))
             raise
 
-    def is_user_inactive(self, current_mouse_pos: Tuple[int, int], current_time: int) -> bool:
-        """Check if the user is inactive based on mouse movement and time."""
-        if current_mouse_pos == self.prev_mouse_pos:
-            if self.prev_action_ts and current_time - self.prev_action_ts > INACTIVITY_THRESHOLD:
+    def _check_log_format(self) -> None:
+        """Refuse to append to an existing log written in the other format."""
+        with open(self.log_file, "rb") as file:
+            if self.binary:
+                matches = file.read(len(BINARY_LOG_MAGIC)) == BINARY_LOG_MAGIC
+            else:
+                header = file.readline(1024).rstrip(b"\r\n")
+                matches = header == ",".join(ACTIVITY_FIELDS).encode()
+        if not matches:
+            fmt = "binary" if self.binary else "CSV"
+            raise ValueError(f"{self.log_file} is not a {fmt} activity log")
+        if self.binary:
+            dropped = truncate_torn_tail(self.log_file)
+            if dropped:
+                logger.warning("Dropped %d bytes of a partly written record from %s",
+                               dropped, str(self.log_file))
+
+    def _open_log_file(self) -> None:
+        """Open the log file for appending, kept open for the logger's lifetime."""
+        if self.binary:
+            self._file = open(self.log_file, "ab", buffering=LOG_BUFFER_SIZE)
+        else:
+            self._file = open(self.log_file, "a", newline="", buffering=LOG_BUFFER_SIZE)
+
+    def _write_row(self, app_name: str, title: str, timestamp: int) -> None:
+        """Queue one log row in the log's format, flushing once enough are pending."""
+        if self.binary:
+            # Length-prefixed records need no quoting at all
+            self._pending.append(pack_record(app_name, title, timestamp))
+        else:
+            # Formatting the three known columns directly skips csv.writer's
+            # generic per-field dispatch
+            self._pending.append(f"{_quote(app_name)},{_quote(title)},{timestamp}\r\n")
+        if len(self._pending) >= LOG_FLUSH_ROWS:
+            self.flush()
+
+    def _flush_if_stale(self, current_mono: float) -> None:
+        """Flush pending rows once the oldest has waited LOG_FLUSH_INTERVAL."""
+        if self._pending and current_mono - self._pending_since >= LOG_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending rows to the log file in a single call."""
+        if self._file is None:
+            return
+        if self._pending:
+            self._file.write((b"" if self.binary else "").join(self._pending))
+            self._pending.clear()
+        self._file.flush()
+
+    def sync(self) -> None:
+        """Flush pending rows and, if fsync_on_pause is set, force them to disk."""
+        self.flush()
+        if self.fsync_on_pause and self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Sync pending rows and close the log file if it is open."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def mouse_has_moved(self, current_mouse_pos: Tuple[int, int]) -> bool:
+        """Check if the mouse left the dead zone around its last recorded position."""
+        # Sensor jitter of a pixel or two should not count as activity
+        if self.prev_mouse_pos is None:
+            return True
+        dx = current_mouse_pos[0] - self.prev_mouse_pos[0]
+        dy = current_mouse_pos[1] - self.prev_mouse_pos[1]
+        return dx * dx + dy * dy > MOUSE_DEAD_ZONE_SQ
+
+    def is_user_inactive(self, current_mouse_pos: Tuple[int, int], current_mono: float) -> bool:
+        """Check if the user is inactive based on mouse movement and monotonic time."""
+        if not self.mouse_has_moved(current_mouse_pos):
+            if self.prev_action_ts and current_mono - self.prev_action_ts > self.inactivity_threshold:
                 return True
         return False
 
@@ -87,45 +315,193 @@ class ActivityLogger:
         self.prev_mouse_pos = pmc.getMousePos()
         
         logger.info("Starting activity tracking")
+        worker = threading.Thread(target=self._worker, name="tracker-worker", daemon=True)
+        worker.start()
+
+        # The loop never ends while tracking, so resolve its module and
+        # attribute lookups once up front
+        get_mouse_pos = pmc.getMousePos
+        wall_clock = time.time
+        mono_clock = time.monotonic
+        wait = self._stop.wait
         
         while True:
             try:
-                current_mouse_pos = pmc.getMousePos()
-                current_time = int(time.time())
+                # Wall-clock time stamps rows; monotonic time drives the idle and
+                # polling intervals so clock adjustments cannot trigger them
+                current_time = int(wall_clock())
+                current_mono = mono_clock()
 
-                if self.is_user_inactive(current_mouse_pos, current_time):
-                    self.pause()
-                    time.sleep(self.log_interval)
-                    continue
+                self._collect_worker_results()
+                # Nothing to track behind a lock screen, so skip the mouse
+                # and window queries until it is unlocked
+                if self._is_locked(current_time, current_mono):
+                    self._on_locked(current_time)
+                else:
+                    self._on_mouse_poll(get_mouse_pos(), current_time, current_mono)
 
-                self.prev_mouse_pos = current_mouse_pos
-                current_info = self.get_window_info()
-
-                if current_info and (not self.prev_info or 
-                                   current_info.app_name != self.prev_info.app_name or 
-                                   current_info.title != self.prev_info.title):
-                    current_info.timestamp = current_time
-                    self.log_window_info(current_info)
-                    self.prev_info = current_info
+                self._flush_if_stale(current_mono)
 
             except Exception as e:
                 logger.error("Error in main loop: %s", str(e))
-                time.sleep(self.log_interval)
-            else:
-                time.sleep(self.log_interval)
 
-    def pause(self) -> None:
-        """Log a pause in activity."""
+            # Returns early, and ends the loop, once stop() is called
+            if wait(self._poll_interval):
+                break
+
+        self._worker_requests.put(None)
+
+    def _on_mouse_poll(self, current_mouse_pos: Tuple[int, int], current_time: int,
+                       current_mono: float) -> None:
+        """Advance the ACTIVE/IDLE state from a mouse poll and request window checks."""
+        mouse_moved = self.mouse_has_moved(current_mouse_pos)
+
+        if mouse_moved:
+            # Movement inside the dead zone keeps the old position, so
+            # slow drift still adds up to a real move eventually
+            self.prev_mouse_pos = current_mouse_pos
+            self.prev_action_ts = current_mono
+            self._mouse_moved = True
+            # Resuming logs nothing itself: prev_info is the pause row,
+            # so the next window check logs the current window
+            self._state = ACTIVE
+        elif self._state == ACTIVE and self.is_user_inactive(current_mouse_pos, current_mono):
+            self._state = IDLE
+            self.pause(current_time)
+
+        self._update_poll_interval(mouse_moved)
+        if (self._state == ACTIVE and not self._window_query_pending
+                and self._window_check_due(current_mono)):
+            self._request_window(current_time, current_mono)
+
+    def _on_locked(self, current_time: int) -> None:
+        """Pause immediately on a locked screen and poll slowly until it unlocks."""
+        if self._state == ACTIVE:
+            self._state = IDLE
+            self.pause(current_time)
+        # Come back soon for an answer in flight, otherwise at the next probe
+        if self._lock_probe_pending:
+            self._poll_interval = self.mouse_poll_interval
+        else:
+            self._poll_interval = LOCKED_POLL_INTERVAL
+
+    def _is_locked(self, current_time: int, current_mono: float) -> bool:
+        """Report the last known lock state, asking the worker for a fresh probe when due.
+
+        The probe runs every LOCKED_POLL_INTERVAL while locked and every
+        LOCK_CHECK_INTERVAL while unlocked.
+        """
+        if self._locked is None:
+            return False
+        interval = LOCKED_POLL_INTERVAL if self._locked else LOCK_CHECK_INTERVAL
+        if current_mono - self._last_lock_check >= interval and not self._lock_probe_pending:
+            self._last_lock_check = current_mono
+            self._lock_probe_pending = True
+            self._worker_requests.put(("lock", current_time))
+        return self._locked
+
+    def _update_poll_interval(self, mouse_moved: bool) -> None:
+        """Double the polling wait while the mouse is still, resetting it on movement."""
+        if mouse_moved:
+            self._poll_interval = self.mouse_poll_interval
+            return
+        # While active keep to log_interval, so window checks still catch
+        # keyboard-only activity; once idle back off to the cap
+        if self._state == IDLE:
+            cap = MAX_IDLE_POLL_INTERVAL
+        else:
+            cap = max(self.log_interval, self.mouse_poll_interval)
+        self._poll_interval = min(self._poll_interval * 2, cap)
+
+    def _window_check_due(self, current_mono: float) -> bool:
+        """Decide whether the active window should be queried on this poll."""
+        # Window queries are costly: they run at most every log_interval
+        # seconds, and while the mouse is still only every WINDOW_CHECK_INTERVAL
+        elapsed = current_mono - self._last_window_check
+        if elapsed < self.log_interval:
+            return False
+        return self._mouse_moved or elapsed > WINDOW_CHECK_INTERVAL
+
+    def _request_window(self, current_time: int, current_mono: float) -> None:
+        """Ask the worker thread to query the active window."""
+        self._last_window_check = current_mono
+        self._mouse_moved = False
+        self._window_query_pending = True
+        self._worker_requests.put(("window", current_time))
+
+    def _worker(self) -> None:
+        """Answer window and lock queries off the main loop, since they can block."""
+        get_request = self._worker_requests.get
+        request_done = self._worker_requests.task_done
+        put_result = self._worker_results.put
+        get_window_info = self.get_window_info
+        while True:
+            request = get_request()
+            try:
+                if request is None:
+                    return
+                kind, timestamp = request
+                try:
+                    answer = get_window_info() if kind == "window" else _probe_screen_locked()
+                except Exception as e:
+                    # Keep the worker alive and still answer, so the loop's
+                    # pending flag clears and the query is retried later
+                    logger.error("Error in %s query: %s", kind, str(e))
+                    answer = None if kind == "window" else False
+                put_result((kind, timestamp, answer))
+            finally:
+                request_done()
+
+    def _collect_worker_results(self) -> None:
+        """Apply any window and lock answers the worker has posted since the last poll."""
+        while True:
+            try:
+                kind, timestamp, answer = self._worker_results.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "lock":
+                self._lock_probe_pending = False
+                self._locked = answer
+                if answer is None:
+                    logger.info("Screen lock detection unavailable, relying on mouse idleness")
+                continue
+            self._window_query_pending = False
+            # A query that was in flight when the user went idle is stale
+            if self._state == ACTIVE:
+                self._log_if_changed(answer, timestamp)
+
+    def _log_if_changed(self, current_info: Optional[WindowInfo], current_time: int) -> None:
+        """Log a queried window unless it matches the previous entry."""
+        if current_info is not None and current_info is not self.prev_info:
+            key = (current_info.app_name, current_info.title)
+            if key != self._prev_key:
+                current_info.timestamp = current_time
+                self.log_window_info(current_info)
+                self.prev_info = current_info
+                self._prev_key = key
+
+    def stop(self) -> None:
+        """Ask the main loop to exit, interrupting any wait in progress."""
+        self._stop.set()
+
+    def pause(self, timestamp: Optional[int] = None) -> None:
+        """Log a pause in activity, at the given unix time or now."""
         if self.prev_info and self.prev_info.app_name == "_pause":
             return
             
-        pause_info = WindowInfo(app_name="_pause", title="", timestamp=int(time.time()))
+        pause_info = WindowInfo(app_name="_pause", title="", timestamp=timestamp or int(time.time()))
         self.log_window_info(pause_info)
+        self.sync()
         self.prev_info = pause_info
+        self._prev_key = (pause_info.app_name, pause_info.title)
         logger.info("Activity paused due to inactivity")
 
     def exit(self) -> None:
         """Log program exit."""
+        if self._file is None:
+            # Tracking never started, e.g. the log file was rejected
+            return
         exit_info = WindowInfo(app_name="_exit", title="", timestamp=int(time.time()))
         self.log_window_info(exit_info)
+        self.close()
         logger.info("ActivityLogger shutting down")
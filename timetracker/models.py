@@ -1,10 +1,14 @@
 """Data models for the time tracker application."""
 
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+import sys
 import time
 
-@dataclass
+# dataclass(slots=True) is only available from Python 3.10
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class WindowInfo:
     """Information about a window activity."""
     app_name: str
@@ -19,6 +23,10 @@ class WindowInfo:
             "timestamp": str(self.timestamp or int(time.time()))
         }
 
+    def to_row(self) -> Tuple[str, str, int]:
+        """Convert the window info to a CSV row in ACTIVITY_FIELDS order."""
+        return (self.app_name, self.title, self.timestamp or int(time.time()))
+
 @dataclass
 class ActivitySummary:
     """Summary of activity data."""
@@ -1,15 +1,7 @@
 """Visualization module for the time tracker application."""
 
-import os
-import contextlib
 from datetime import date
-from typing import List, Dict, Tuple
-
-# Suppress IMK messages
-with contextlib.redirect_stderr(open(os.devnull, 'w')):
-    import matplotlib.pyplot as plt
-    import matplotlib
-    matplotlib.use('Agg')
+from typing import List, Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -18,30 +10,55 @@ from .config import VisualizationConfig
 from .models import ActivitySummary
 
 
+# pyplot module and active style, set up on first use
+_pyplot = None
+_applied_style: Optional[str] = None
+
+
+def _load_pyplot():
+    """Import pyplot on first use so text-only runs never pay for matplotlib."""
+    global _pyplot
+    if _pyplot is None:
+        # Select the non-interactive backend before pyplot initializes one,
+        # which also avoids the IMK messages the macOS GUI backend printed
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        _pyplot = plt
+    return _pyplot
+
+
+def _apply_style(style: str) -> None:
+    """Apply a matplotlib style, skipping the work if it is already active."""
+    global _applied_style
+    if style != _applied_style:
+        _load_pyplot().style.use(style)
+        _applied_style = style
+
+
 class ActivityVisualizer:
     """Handles visualization of activity data."""
     
     def __init__(self, config: VisualizationConfig = VisualizationConfig()):
         """Initialize the visualizer with configuration."""
         self.config = config
-        plt.style.use(config.style)
 
     def create_visualizations(self, summaries: List[ActivitySummary], 
                             target_date: date,
                             plot_type: str = 'both') -> None:
         """Create requested visualizations."""
-        if not summaries:
+        if not summaries or plot_type == 'none':
             return
 
+        plt = _load_pyplot()
+        _apply_style(self.config.style)
+
         # Prepare data
-        data = pd.DataFrame([
-            {
-                'category': s.category,
-                'minutes': s.minutes,
-                'percentage': s.percentage
-            }
-            for s in summaries
-        ])
+        data = pd.DataFrame({
+            'category': [s.category for s in summaries],
+            'minutes': np.fromiter((s.minutes for s in summaries), dtype=float, count=len(summaries)),
+            'percentage': np.fromiter((s.percentage for s in summaries), dtype=float, count=len(summaries)),
+        })
         
         # Generate color palette
         colors = plt.cm.Set3(np.linspace(0, 1, len(data)))
@@ -55,6 +72,7 @@ class ActivityVisualizer:
     def _create_bar_chart(self, data: pd.DataFrame, colors: np.ndarray, 
                          target_date: date) -> None:
         """Create a horizontal bar chart of time distribution."""
+        plt = _load_pyplot()
         plt.figure(figsize=self.config.figure_size_bar)
         
         # Sort data by duration
@@ -88,10 +106,11 @@ class ActivityVisualizer:
     def _create_pie_chart(self, data: pd.DataFrame, colors: np.ndarray, 
                          target_date: date) -> None:
         """Create a pie chart of time distribution."""
+        plt = _load_pyplot()
         plt.figure(figsize=self.config.figure_size_pie)
         
         # Process data for pie chart
-        processed_data = self._process_pie_data(data)
+        processed_data = self._process_pie_data(data, colors)
         
         # Create pie chart
         patches, texts, autotexts = plt.pie(
@@ -122,38 +141,32 @@ class ActivityVisualizer:
         plt.savefig('activity_pie.png', bbox_inches='tight', dpi=self.config.dpi)
         plt.close()
 
-    def _process_pie_data(self, data: pd.DataFrame) -> Dict:
+    def _process_pie_data(self, data: pd.DataFrame, colors: np.ndarray) -> Dict:
         """Process data for pie chart visualization."""
-        values = []
-        labels = []
-        colors_filtered = []
-        explode = []
-        other_sum = 0
-        other_activities = []
-        main_categories = []
-        
-        total = data['minutes'].sum()
-        
-        for i, row in data.iterrows():
-            pct = (row['minutes'] / total) * 100
-            if pct < self.config.small_segment_threshold:
-                other_sum += row['minutes']
-                other_activities.append(f"{row['category']} ({row['minutes']:.1f}m)")
-            else:
-                values.append(row['minutes'])
-                labels.append(row['category'])
-                colors_filtered.append(plt.cm.Set3(i / len(data)))
-                explode.append(0.1 if pct < 10 else 0)
-                main_categories.append(f"{row['category']} ({row['minutes']:.1f}m)")
-        
+        plt = _load_pyplot()
+        minutes = data['minutes'].to_numpy()
+        categories = data['category'].to_numpy()
+        pct = minutes / minutes.sum() * 100
+
+        # Split into main segments and small ones folded into "Other"
+        small = pct < self.config.small_segment_threshold
+        main = ~small
+        values = minutes[main]
+        labels = categories[main]
+        colors_filtered = colors[main]
+        explode = np.where(pct[main] < 10, 0.1, 0.0)
+        main_categories = [f"{c} ({m:.1f}m)" for c, m in zip(labels, values)]
+        other_activities = [f"{c} ({m:.1f}m)" for c, m in zip(categories[small], minutes[small])]
+        other_sum = minutes[small].sum()
+
         # Add "Other" category if needed
         if other_sum > 0:
-            values.append(other_sum)
-            labels.append("Other")
-            colors_filtered.append(plt.cm.Greys(0.5))
-            explode.append(0.1)
+            values = np.append(values, other_sum)
+            labels = np.append(labels, "Other")
+            colors_filtered = np.vstack([colors_filtered, plt.cm.Greys(0.5)])
+            explode = np.append(explode, 0.1)
             main_categories.append(f"Other ({other_sum:.1f}m)")
-            
+
         return {
             'values': values,
             'labels': labels,
@@ -173,6 +186,7 @@ class ActivityVisualizer:
 
     def _add_pie_legend(self, patches: List, data: Dict) -> None:
         """Add legend to pie chart."""
+        plt = _load_pyplot()
         legend_labels = data['main_categories'].copy()
         if data['other_activities']:
             legend_labels.append("Small categories:")
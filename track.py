@@ -2,10 +2,11 @@
 
 import atexit
 import argparse
+import signal
 from pathlib import Path
 
 from timetracker import ActivityLogger
-from timetracker.config import DEFAULT_LOG_FILE, DEFAULT_LOG_INTERVAL
+from timetracker.config import DEFAULT_BINARY_LOG_FILE, DEFAULT_LOG_FILE, DEFAULT_LOG_INTERVAL
 
 def main():
     """Main entry point for the activity tracker."""
@@ -13,20 +14,34 @@ def main():
     parser.add_argument(
         '--interval', '-i',
         type=int,
-        default=DEFAULT_LOG_INTERVAL,
-        help=f'Logging interval in seconds (default: {DEFAULT_LOG_INTERVAL})'
+        help=f'Logging interval in seconds (default: $TIME_TRACKER_INTERVAL or {DEFAULT_LOG_INTERVAL})'
     )
     parser.add_argument(
         '--log-file', '-l',
         type=Path,
-        default=DEFAULT_LOG_FILE,
-        help=f'Path to log file (default: {DEFAULT_LOG_FILE})'
+        help=f'Path to log file (default: {DEFAULT_LOG_FILE}, or {DEFAULT_BINARY_LOG_FILE} with --binary)'
+    )
+    parser.add_argument(
+        '--binary', '-b',
+        action='store_true',
+        help='Write a binary framed log; convert it for analysis with replay'
+    )
+    parser.add_argument(
+        '--fsync',
+        action='store_true',
+        help='Force the log to disk on every pause and on exit'
     )
     args = parser.parse_args()
+    if args.log_file is None:
+        args.log_file = Path(DEFAULT_BINARY_LOG_FILE if args.binary else DEFAULT_LOG_FILE)
 
     try:
-        logger = ActivityLogger(args.log_file, args.interval)
+        logger = ActivityLogger(
+            args.log_file, args.interval, binary=args.binary, fsync_on_pause=args.fsync
+        )
         atexit.register(logger.exit)
+        # Let SIGTERM end the loop normally so the exit row is still written
+        signal.signal(signal.SIGTERM, lambda signum, frame: logger.stop())
         logger.run()
     except KeyboardInterrupt:
         print("\nStopping activity tracker...")